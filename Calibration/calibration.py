@@ -3,8 +3,10 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
+import io
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 년도와 날짜를 이름으로 폴더 만들고 그 안에 calidata 폴더와 cali_weights.txt 파일 넣어주기 
@@ -14,6 +16,11 @@ DATE_FOLDER = "4_2"
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 data_dir = PROJECT_ROOT / "Data" / YEAR / DATE_FOLDER / "calidata"
 weights_file = PROJECT_ROOT / "Data" / YEAR / DATE_FOLDER / "cali_weights.txt"
+# calidata 파싱 결과 캐시 (TEST 파일이 바뀌면 자동으로 다시 읽음)
+cache_file = PROJECT_ROOT / "Data" / YEAR / DATE_FOLDER / "calidata_cache.npy"
+cache_info_file = PROJECT_ROOT / "Data" / YEAR / DATE_FOLDER / "calidata_cache.json"
+READ_BUFFER_SIZE = 1 << 20
+MAX_WORKERS = 8
 measured_value = []
 
 data_files = sorted(
@@ -22,25 +29,60 @@ data_files = sorted(
     if filename.upper().startswith("TEST") and filename.upper().endswith(".TXT")
 )
 
-for filename in data_files:
+
+def read_average(filename):
+    """TEST 파일 하나의 평균값을 반환 (실패 시 None과 메시지)"""
     filepath = data_dir / filename
 
     if not os.path.isfile(filepath):
-        print(f"파일 없음: {filename}")
-        continue
+        return None, f"파일 없음: {filename}"
+
+    with open(filepath, 'rb', buffering=READ_BUFFER_SIZE) as file:
+        data = file.read()
+
+    if not data.strip():
+        return None, f"빈 파일: {filename}"
+    try:
+        return float(np.loadtxt(io.BytesIO(data), dtype=np.float64, ndmin=1).mean()), None
+    except ValueError:
+        return None, f"숫자 변환 오류: {filename}"
 
-    with open(filepath, 'r') as file:
-        lines = file.readlines()
+
+cache_signature = {filename: os.path.getmtime(data_dir / filename) for filename in data_files}
+cached_signature = None
+if os.path.isfile(cache_file) and os.path.isfile(cache_info_file):
+    with open(cache_info_file, 'r') as file:
         try:
-            numbers = [float(line.strip()) for line in lines if line.strip() != '']
-            if len(numbers) == 0:
-                print(f"빈 파일: {filename}")
-                continue
-            average = sum(numbers) / len(numbers)
-            measured_value.append(average)
-        except ValueError:
-            print(f"숫자 변환 오류: {filename}")
+            cached_signature = json.load(file)
+        except json.JSONDecodeError:
+            cached_signature = None  # 손상된 캐시 정보는 캐시 없음으로 처리
+
+cached_value = None
+if cached_signature == cache_signature:
+    try:
+        cached_value = np.load(cache_file)
+    except (OSError, ValueError, EOFError):
+        cached_value = None  # 손상되거나 잘린 캐시 파일은 캐시 없음으로 처리
+
+if cached_value is not None:
+    print(f"캐시된 측정값 사용: {cache_file}")
+    measured_value = cached_value.tolist()
+else:
+    # 파일별로 병렬 파싱, 메시지는 파일 순서대로 출력
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(read_average, data_files))
+
+    for average, message in results:
+        if message is not None:
+            print(message)
             continue
+        measured_value.append(average)
+
+    # 실패한 파일이 있으면 캐시하지 않음 (다음 실행에서도 오류 메시지가 보이도록)
+    if all(message is None for _, message in results):
+        np.save(cache_file, np.array(measured_value))
+        with open(cache_info_file, 'w') as file:
+            json.dump(cache_signature, file)
 
 value = np.array(measured_value).reshape(-1, 1)
 print(f"로드셀 평균 값: {value.flatten()}")
@@ -59,17 +101,16 @@ print(f"누적 질량 값 (kg): {truevalue}")
 if len(value) != len(truevalue):
     raise ValueError(f"값 불일치: {len(value)} 측정값 but {len(truevalue)} 증분 질량 값!")
 
-# Linear Regression Model
-model = LinearRegression()
-model.fit(value, truevalue)
+# Linear Regression (1차 최소제곱 직선)
+slope, intercept = np.polyfit(value.ravel(), truevalue, 1)
 
 # Predict for plotting
-predicted = model.predict(value)
+predicted = slope * value.ravel() + intercept
 
-# Coefficients
-slope = model.coef_[0]
-intercept = model.intercept_
-r_squared = model.score(value, truevalue)
+# Coefficient of determination
+ss_res = np.sum((truevalue - predicted) ** 2)
+ss_tot = np.sum((truevalue - np.mean(truevalue)) ** 2)
+r_squared = 1 - ss_res / ss_tot
 print(f"Best fit line: y = {slope:.4f}x + {intercept:.4f}")
 print(f"R²: {r_squared:.6f}")
 
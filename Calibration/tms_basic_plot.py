@@ -27,11 +27,16 @@ LOADCELL_LOWPASS_ORDER = 2
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "Data" / YEAR / DATE_FOLDER 
 INPUT_FILE = DATA_DIR / INPUT_FILENAME
+READ_BUFFER_SIZE = 1 << 20
+FORCE_SCALE = CALIBRATION_SLOPE * GRAVITATIONAL_CONSTANT
+FORCE_BIAS = CALIBRATION_INTERCEPT * GRAVITATIONAL_CONSTANT + FORCE_OFFSET
 
 
 def calibrated_force(adc_value: float | np.ndarray) -> float | np.ndarray:
     """Convert loadcell ADC values to force in Newtons."""
-    return (CALIBRATION_INTERCEPT + CALIBRATION_SLOPE * adc_value) * GRAVITATIONAL_CONSTANT + FORCE_OFFSET
+    force = adc_value * FORCE_SCALE
+    force += FORCE_BIAS
+    return force
 
 
 def zero_phase_lowpass(values: np.ndarray, cutoff_hz: float, order: int) -> np.ndarray:
@@ -53,11 +58,8 @@ def load_single_channel_values(file_path: str | Path, line_mode: str = "full") -
     file_path = Path(file_path)
     if not file_path.is_file():
         raise FileNotFoundError(f"File not found: {file_path}")
-    with file_path.open("r", encoding="utf-8") as file:
-        lines = [line.strip() for line in file if line.strip()]
-
-    values = np.array([float(line) for line in lines], dtype=float)
-    values = values[SKIP_INITIAL_LINES:]
+    with file_path.open("rb", buffering=READ_BUFFER_SIZE) as file:
+        values = np.loadtxt(file, dtype=float, ndmin=1)[SKIP_INITIAL_LINES:]
 
     if line_mode == "odd":
         selected_values = values[0::2]
@@ -68,7 +70,7 @@ def load_single_channel_values(file_path: str | Path, line_mode: str = "full") -
     else:
         raise ValueError("LINE_MODE must be 'full', 'odd', or 'even'.")
 
-    return np.array(selected_values, dtype=float)
+    return np.ascontiguousarray(selected_values)
 
 
 def main() -> None:
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 
 import matplotlib.pyplot as plt
@@ -45,8 +46,10 @@ GENERATE_PLOTS = True
 SAVE_PLOT = True
 SAVE_REPORT = True
 SAVE_DATA = True
+DATA_FORMAT = "txt"  # "txt" or "npy"
 OUTPUT_FOLDER_NAME = "analysis"
 PLOT_DPI = 600
+PLOT_MAX_POINTS = 4000
 
 # Plot palette
 FORCE_RAW_COLOR = "#9FA9B5"
@@ -78,31 +81,51 @@ OUTPUT_DIR = DATA_DIR / OUTPUT_FOLDER_NAME
 REPORT_RULE = "=" * 72
 SECTION_RULE = "-" * 72
 INTERLEAVED_CHANNEL_COUNT = 2
+READ_BUFFER_SIZE = 1 << 20
+SAMPLE_DTYPE = np.float32
+FORCE_SCALE = CALIBRATION_SLOPE * GRAVITATIONAL_CONSTANT
+FORCE_BIAS = CALIBRATION_INTERCEPT * GRAVITATIONAL_CONSTANT + FORCE_OFFSET
 
 
 # ===== INPUT LOADING =====
-def load_interleaved_channel(file_path: str | Path, channel_index: int) -> np.ndarray:
-    """Load one channel from an interleaved TMS text file."""
+def load_interleaved_values(file_path: str | Path) -> np.ndarray:
+    """Load every numeric line of an interleaved TMS text file."""
     file_path = Path(file_path)
     if not file_path.is_file():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    with file_path.open("r", encoding="utf-8") as file:
-        lines = [line.strip() for line in file if line.strip()]
+    with file_path.open("rb", buffering=READ_BUFFER_SIZE) as file:
+        return np.loadtxt(file, dtype=SAMPLE_DTYPE, ndmin=1)
 
-    values = [float(lines[i]) for i in range(channel_index, len(lines), INTERLEAVED_CHANNEL_COUNT)]
-    return np.array(values, dtype=float)[SKIP_INITIAL_LINES:]
+
+def extract_channel(interleaved_values: np.ndarray, channel_index: int) -> np.ndarray:
+    """Select one channel from already-loaded interleaved values."""
+    return np.ascontiguousarray(interleaved_values[channel_index::INTERLEAVED_CHANNEL_COUNT][SKIP_INITIAL_LINES:])
 
 
 # ===== SIGNAL CONVERSION AND CORRECTION =====
 def calibrated_force(adc_value: float | np.ndarray) -> float | np.ndarray:
     """Convert loadcell ADC values to force in Newtons."""
-    return (CALIBRATION_INTERCEPT + CALIBRATION_SLOPE * adc_value) * GRAVITATIONAL_CONSTANT + FORCE_OFFSET
+    force = np.multiply(adc_value, FORCE_SCALE, dtype=np.float64)
+    force += FORCE_BIAS
+    return force
 
 
 def convert_to_pressure(raw_values: np.ndarray) -> np.ndarray:
     """Convert barometer channel values to pressure using the provided linear calibration."""
-    return PRESSURE_SLOPE * raw_values + PRESSURE_INTERCEPT
+    pressure = np.multiply(raw_values, PRESSURE_SLOPE, dtype=np.float64)
+    pressure += PRESSURE_INTERCEPT
+    return pressure
+
+
+@lru_cache(maxsize=None)
+def lowpass_coefficients(cutoff_hz: float, order: int) -> tuple[np.ndarray, np.ndarray]:
+    """Design the Butterworth low-pass once per cutoff/order pair."""
+    nyquist_hz = 0.5 * SAMPLING_RATE
+    if cutoff_hz <= 0 or cutoff_hz >= nyquist_hz:
+        raise ValueError(f"cutoff_hz must be between 0 and {nyquist_hz:.2f} Hz")
+
+    return butter(order, cutoff_hz / nyquist_hz, btype="low")
 
 
 def zero_phase_lowpass(values: np.ndarray, cutoff_hz: float, order: int) -> np.ndarray:
@@ -110,11 +133,7 @@ def zero_phase_lowpass(values: np.ndarray, cutoff_hz: float, order: int) -> np.n
     if values.size < 3:
         return values.copy()
 
-    nyquist_hz = 0.5 * SAMPLING_RATE
-    if cutoff_hz <= 0 or cutoff_hz >= nyquist_hz:
-        raise ValueError(f"cutoff_hz must be between 0 and {nyquist_hz:.2f} Hz")
-
-    b, a = butter(order, cutoff_hz / nyquist_hz, btype="low")
+    b, a = lowpass_coefficients(cutoff_hz, order)
     padlen = 3 * (max(len(a), len(b)) - 1)
     if values.size <= padlen:
         return values.copy()
@@ -123,14 +142,14 @@ def zero_phase_lowpass(values: np.ndarray, cutoff_hz: float, order: int) -> np.n
 
 def find_event_bounds(signal: np.ndarray, threshold_ratio: float) -> dict[str, float | int]:
     """Find the first and last threshold crossings for a positive-going event."""
-    peak_value = float(np.max(signal))
     peak_idx = int(np.argmax(signal))
+    peak_value = float(signal[peak_idx])
     threshold_value = threshold_ratio * peak_value
     above_threshold = signal >= threshold_value
+    start_idx = int(np.argmax(above_threshold))
 
-    if np.any(above_threshold):
-        start_idx = int(np.where(above_threshold)[0][0])
-        end_idx = int(np.where(above_threshold)[0][-1])
+    if above_threshold[start_idx]:
+        end_idx = len(signal) - 1 - int(np.argmax(above_threshold[::-1]))
     else:
         start_idx = 0
         end_idx = len(signal) - 1
@@ -144,17 +163,18 @@ def find_event_bounds(signal: np.ndarray, threshold_ratio: float) -> dict[str, f
     }
 
 
-def calculate_horizontal_offset(raw_force: np.ndarray) -> dict[str, float]:
+def calculate_horizontal_offset(raw_force: np.ndarray, filtered_force: np.ndarray) -> dict[str, float]:
     """Average raw loadcell force from start to half the detected ignition-start time."""
-    filtered_force = zero_phase_lowpass(raw_force, LOADCELL_LOWPASS_CUTOFF_HZ, LOADCELL_LOWPASS_ORDER)
     seed_count = max(5, min(filtered_force.size, int(0.5 * SAMPLING_RATE)))
     baseline_seed = float(np.mean(filtered_force[:seed_count]))
     peak_force = float(np.max(filtered_force))
     trigger_force = baseline_seed + THRUST_EVENT_THRESHOLD_RATIO * (peak_force - baseline_seed)
-    ignition_candidates = np.where(filtered_force >= trigger_force)[0]
-    ignition_idx = int(ignition_candidates[0]) if ignition_candidates.size else filtered_force.size - 1
+    above_trigger = filtered_force >= trigger_force
+    ignition_idx = int(np.argmax(above_trigger))
+    if not above_trigger[ignition_idx]:
+        ignition_idx = filtered_force.size - 1
     averaging_end_idx = max(1, ignition_idx // 2)
-    offset_force = float(np.mean(raw_force[:averaging_end_idx]))
+    offset_force = float(np.mean(raw_force[:averaging_end_idx], dtype=np.float64))
     return {
         "offset_force": offset_force,
         "averaging_end_idx": averaging_end_idx,
@@ -163,8 +183,12 @@ def calculate_horizontal_offset(raw_force: np.ndarray) -> dict[str, float]:
     }
 
 
-def apply_drift_correction(raw_force: np.ndarray) -> dict[str, object]:
-    """Apply the selected normal-use drift mode."""
+def apply_drift_correction(raw_force: np.ndarray, filtered_raw_force: np.ndarray) -> dict[str, object]:
+    """Apply the selected normal-use drift mode to the raw and filtered force.
+
+    The low-pass filter is linear with unit DC gain, so removing a constant offset
+    after filtering gives the same trace as filtering the corrected force.
+    """
     if DRIFT_MODE == "off":
         return {
             "mode": "off",
@@ -172,10 +196,11 @@ def apply_drift_correction(raw_force: np.ndarray) -> dict[str, object]:
             "description": "No drift correction applied.",
             "modeled_drift": np.zeros_like(raw_force),
             "corrected_force": raw_force.copy(),
+            "filtered_force": filtered_raw_force,
         }
 
     if DRIFT_MODE == "horizontal":
-        offset_result = calculate_horizontal_offset(raw_force)
+        offset_result = calculate_horizontal_offset(raw_force, filtered_raw_force)
         offset_force = float(offset_result["offset_force"])
         return {
             "mode": "horizontal",
@@ -186,8 +211,9 @@ def apply_drift_correction(raw_force: np.ndarray) -> dict[str, object]:
                 f"{offset_result['averaging_end_idx']} samples; ignition start at "
                 f"{offset_result['ignition_time_s']:.6f} s)"
             ),
-            "modeled_drift": np.full_like(raw_force, offset_force, dtype=float),
+            "modeled_drift": np.full_like(raw_force, offset_force),
             "corrected_force": raw_force - offset_force,
+            "filtered_force": filtered_raw_force - offset_force,
             "offset_force": offset_force,
             "averaging_end_idx": int(offset_result["averaging_end_idx"]),
             "averaging_end_time_s": float(offset_result["averaging_end_time_s"]),
@@ -203,10 +229,17 @@ def calculate_pressure_baseline(pressure_values: np.ndarray) -> float:
         return 0.0
 
     baseline_count = max(5, min(pressure_values.size, int(PRESSURE_BASELINE_WINDOW_SECONDS * SAMPLING_RATE)))
-    return float(np.mean(pressure_values[:baseline_count]))
+    return float(np.mean(pressure_values[:baseline_count], dtype=np.float64))
 
 
 # ===== METRICS =====
+def trapezoid_uniform(values: np.ndarray, dx: float) -> float:
+    """Integrate uniformly spaced samples with the trapezoidal rule in a single reduction."""
+    if values.size == 0:
+        return 0.0
+    return float(dx * (values.sum(dtype=np.float64) - 0.5 * (float(values[0]) + float(values[-1]))))
+
+
 def calculate_pressure_metrics(time: np.ndarray, filtered_gauge_pressure: np.ndarray) -> dict[str, float]:
     """Calculate peak pressure metrics from the filtered gauge-pressure trace."""
     peak_idx = int(np.argmax(filtered_gauge_pressure))
@@ -230,7 +263,7 @@ def calculate_thrust_metrics(
     ignition_time = float(time[ignition_idx])
     burnout_time = float(time[burnout_idx])
     burn_time = burnout_time - ignition_time
-    total_impulse = float(np.trapezoid(filtered_force[ignition_idx:burnout_idx + 1], dx=dt))
+    total_impulse = trapezoid_uniform(filtered_force[ignition_idx:burnout_idx + 1], dt)
     avg_thrust = total_impulse / burn_time if burn_time > 0 else 0.0
     specific_impulse = None
     if propellant_mass is not None and propellant_mass > 0:
@@ -363,25 +396,31 @@ def save_pipeline_data(
     raw_gauge_pressure: np.ndarray,
     filtered_gauge_pressure: np.ndarray,
 ) -> None:
-    """Save processed analysis data as a text file."""
+    """Save processed analysis data as a text file, or as a binary .npy array with the same columns."""
     if not SAVE_DATA:
         return
+    if DATA_FORMAT not in ("txt", "npy"):
+        raise ValueError(f"Unsupported DATA_FORMAT: {DATA_FORMAT}. Use 'txt' or 'npy'.")
 
     ensure_output_dir()
-    data_path = get_output_path("pipeline_data.txt")
+    pipeline_data = np.column_stack(
+        (
+            time,
+            raw_force,
+            modeled_drift,
+            corrected_force,
+            filtered_force,
+            raw_gauge_pressure,
+            filtered_gauge_pressure,
+        )
+    )
+    if DATA_FORMAT == "npy":
+        np.save(get_output_path("pipeline_data.npy"), pipeline_data)
+        return
+
     np.savetxt(
-        data_path,
-        np.column_stack(
-            (
-                time,
-                raw_force,
-                modeled_drift,
-                corrected_force,
-                filtered_force,
-                raw_gauge_pressure,
-                filtered_gauge_pressure,
-            )
-        ),
+        get_output_path("pipeline_data.txt"),
+        pipeline_data,
         delimiter="\t",
         header=(
             "time_s\traw_force_N\tdrift_model_N\tcorrected_force_N\tfiltered_force_N\t"
@@ -425,6 +464,28 @@ def save_current_figure(filename: str) -> None:
     plt.savefig(get_output_path(filename), dpi=PLOT_DPI, bbox_inches="tight", facecolor="white")
 
 
+def decimate_for_plot(time: np.ndarray, values: np.ndarray, end_time: float) -> tuple[np.ndarray, np.ndarray]:
+    """Clip a trace to the plotted window, then keep each bin's min and max sample."""
+    # One sample past end_time so the line reaches the right edge of the axes
+    end_idx = min(time.size, int(np.searchsorted(time, end_time, side="right")) + 1)
+    time = time[:end_idx]
+    values = values[:end_idx]
+
+    bin_count = PLOT_MAX_POINTS // 2
+    bin_size = values.size // bin_count
+    if bin_size <= 1:
+        return time, values
+
+    binned_size = bin_count * bin_size
+    bins = values[:binned_size].reshape(bin_count, bin_size)
+    bin_starts = np.arange(0, binned_size, bin_size)
+    min_idx = bin_starts + np.argmin(bins, axis=1)
+    max_idx = bin_starts + np.argmax(bins, axis=1)
+    indices = np.column_stack((np.minimum(min_idx, max_idx), np.maximum(min_idx, max_idx))).ravel()
+    indices = np.concatenate((indices, np.arange(binned_size, values.size)))
+    return time[indices], values[indices]
+
+
 def get_plot_end_time(time: np.ndarray, thrust_metrics: dict[str, object]) -> float:
     """Clamp plots to the burn plus a short post-burn margin."""
     return min(time[-1], thrust_metrics["burnout_time"] + max(0.2, 0.25 * thrust_metrics["burn_time"]))
@@ -467,13 +528,24 @@ def plot_loadcell_summary(
     thrust_metrics: dict[str, object],
 ) -> None:
     """Create a dedicated loadcell/thrust figure."""
-    fig, ax = plt.subplots(figsize=(13, 6.5))
+    fig, ax = plt.subplots(figsize=(13, 6.5), num="loadcell_plot", clear=True)
     plot_end_time = get_plot_end_time(time, thrust_metrics)
     threshold_force = thrust_metrics["threshold_force"]
 
     add_pastel_test_background(ax, time, thrust_metrics)
-    ax.plot(time, corrected_force, color=FORCE_RAW_COLOR, linewidth=1.15, alpha=0.9, label=FORCE_CORRECTED_LABEL)
-    ax.plot(time, filtered_force, color=FORCE_FILTERED_COLOR, linewidth=2.1, label=FORCE_FILTERED_LABEL)
+    ax.plot(
+        *decimate_for_plot(time, corrected_force, plot_end_time),
+        color=FORCE_RAW_COLOR,
+        linewidth=1.15,
+        alpha=0.9,
+        label=FORCE_CORRECTED_LABEL,
+    )
+    ax.plot(
+        *decimate_for_plot(time, filtered_force, plot_end_time),
+        color=FORCE_FILTERED_COLOR,
+        linewidth=2.1,
+        label=FORCE_FILTERED_LABEL,
+    )
     ax.axhline(0, color=ZERO_LINE_COLOR, linewidth=0.6, alpha=0.45)
     ax.axhline(
         threshold_force,
@@ -529,12 +601,23 @@ def plot_barometer_summary(
     pressure_metrics: dict[str, float],
 ) -> None:
     """Create a dedicated barometer/pressure figure."""
-    fig, ax = plt.subplots(figsize=(13, 5.5))
+    fig, ax = plt.subplots(figsize=(13, 5.5), num="barometer_plot", clear=True)
     plot_end_time = get_plot_end_time(time, thrust_metrics)
 
     add_pastel_test_background(ax, time, thrust_metrics)
-    ax.plot(time, raw_gauge_pressure, color=PRESSURE_RAW_COLOR, linewidth=1.15, alpha=0.88, label=PRESSURE_RAW_LABEL)
-    ax.plot(time, filtered_gauge_pressure, color=PRESSURE_FILTERED_COLOR, linewidth=2.0, label=PRESSURE_FILTERED_LABEL)
+    ax.plot(
+        *decimate_for_plot(time, raw_gauge_pressure, plot_end_time),
+        color=PRESSURE_RAW_COLOR,
+        linewidth=1.15,
+        alpha=0.88,
+        label=PRESSURE_RAW_LABEL,
+    )
+    ax.plot(
+        *decimate_for_plot(time, filtered_gauge_pressure, plot_end_time),
+        color=PRESSURE_FILTERED_COLOR,
+        linewidth=2.0,
+        label=PRESSURE_FILTERED_LABEL,
+    )
     ax.axhline(0, color=ZERO_LINE_COLOR, linewidth=0.6, alpha=0.45)
     ax.plot(
         pressure_metrics["peak_pressure_time"],
@@ -568,23 +651,21 @@ def plot_combined_loadcell_barometer(
     pressure_metrics: dict[str, float],
 ) -> None:
     """Create a combined figure with one shared time axis."""
-    fig, ax_force = plt.subplots(figsize=(13, 6.5))
+    fig, ax_force = plt.subplots(figsize=(13, 6.5), num="combined_plot", clear=True)
     ax_pressure = ax_force.twinx()
     plot_end_time = get_plot_end_time(time, thrust_metrics)
 
     add_pastel_test_background(ax_force, time, thrust_metrics)
     ax_pressure.patch.set_alpha(0.0)
     force_corrected_line, = ax_force.plot(
-        time,
-        corrected_force,
+        *decimate_for_plot(time, corrected_force, plot_end_time),
         color=FORCE_RAW_COLOR,
         linewidth=0.9,
         alpha=0.75,
         label=FORCE_CORRECTED_LABEL,
     )
     force_filtered_line, = ax_force.plot(
-        time,
-        filtered_force,
+        *decimate_for_plot(time, filtered_force, plot_end_time),
         color=FORCE_FILTERED_COLOR,
         linewidth=2.1,
         label=FORCE_FILTERED_LABEL,
@@ -606,16 +687,14 @@ def plot_combined_loadcell_barometer(
     ax_force.tick_params(axis="y", labelcolor=FORCE_FILTERED_COLOR)
 
     pressure_raw_line, = ax_pressure.plot(
-        time,
-        raw_gauge_pressure,
+        *decimate_for_plot(time, raw_gauge_pressure, plot_end_time),
         color=PRESSURE_RAW_COLOR,
         linewidth=0.9,
         alpha=0.65,
         label=PRESSURE_RAW_LABEL,
     )
     pressure_filtered_line, = ax_pressure.plot(
-        time,
-        filtered_gauge_pressure,
+        *decimate_for_plot(time, filtered_gauge_pressure, plot_end_time),
         color=PRESSURE_FILTERED_COLOR,
         linewidth=2.0,
         alpha=0.95,
@@ -654,17 +733,19 @@ def plot_combined_loadcell_barometer(
 
 
 def main() -> None:
-    loadcell_adc = load_interleaved_channel(INPUT_FILE, LOADCELL_CHANNEL_INDEX)
-    barometer_raw = load_interleaved_channel(INPUT_FILE, BAROMETER_CHANNEL_INDEX)
+    interleaved_values = load_interleaved_values(INPUT_FILE)
+    loadcell_adc = extract_channel(interleaved_values, LOADCELL_CHANNEL_INDEX)
+    barometer_raw = extract_channel(interleaved_values, BAROMETER_CHANNEL_INDEX)
     time = np.arange(loadcell_adc.size) / SAMPLING_RATE
 
     raw_force = calibrated_force(loadcell_adc)
     raw_pressure = convert_to_pressure(barometer_raw)
 
-    drift_result = apply_drift_correction(raw_force)
+    filtered_raw_force = zero_phase_lowpass(raw_force, LOADCELL_LOWPASS_CUTOFF_HZ, LOADCELL_LOWPASS_ORDER)
+    drift_result = apply_drift_correction(raw_force, filtered_raw_force)
     modeled_drift = drift_result["modeled_drift"]
     corrected_force = drift_result["corrected_force"]
-    filtered_force = zero_phase_lowpass(corrected_force, LOADCELL_LOWPASS_CUTOFF_HZ, LOADCELL_LOWPASS_ORDER)
+    filtered_force = drift_result["filtered_force"]
 
     filtered_pressure = zero_phase_lowpass(raw_pressure, BAROMETER_LOWPASS_CUTOFF_HZ, BAROMETER_LOWPASS_ORDER)
     pressure_baseline = calculate_pressure_baseline(filtered_pressure)
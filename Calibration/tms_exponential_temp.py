@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional
 
@@ -65,42 +66,49 @@ INPUT_FILE = DATA_DIR / INPUT_FILENAME
 DRIFT_FILE = DATA_DIR / DRIFT_FILENAME
 OUTPUT_DIR = DATA_DIR / OUTPUT_FOLDER_NAME
 INTERLEAVED_CHANNEL_COUNT = 2
+READ_BUFFER_SIZE = 1 << 20
+FORCE_SCALE = CALIBRATION_SLOPE * GRAVITATIONAL_CONSTANT
+FORCE_BIAS = CALIBRATION_INTERCEPT * GRAVITATIONAL_CONSTANT + FORCE_OFFSET
 
 
 def load_single_channel_values(file_path: str | Path) -> np.ndarray:
     file_path = Path(file_path)
     if not file_path.is_file():
         raise FileNotFoundError(f"File not found: {file_path}")
-    with file_path.open("r", encoding="utf-8") as file:
-        values = [float(line.strip()) for line in file if line.strip()]
-    return np.array(values, dtype=float)
+    with file_path.open("rb", buffering=READ_BUFFER_SIZE) as file:
+        return np.loadtxt(file, dtype=float, ndmin=1)
 
 
-def load_interleaved_channel(file_path: str | Path, channel_index: int) -> np.ndarray:
-    file_path = Path(file_path)
-    if not file_path.is_file():
-        raise FileNotFoundError(f"File not found: {file_path}")
-    with file_path.open("r", encoding="utf-8") as file:
-        lines = [line.strip() for line in file if line.strip()]
-    values = [float(lines[i]) for i in range(channel_index, len(lines), INTERLEAVED_CHANNEL_COUNT)]
-    return np.array(values, dtype=float)[SKIP_INITIAL_LINES:]
+def extract_channel(interleaved_values: np.ndarray, channel_index: int) -> np.ndarray:
+    return np.ascontiguousarray(interleaved_values[channel_index::INTERLEAVED_CHANNEL_COUNT][SKIP_INITIAL_LINES:])
+
+
+def load_interleaved_values(file_path: str | Path) -> np.ndarray:
+    return load_single_channel_values(file_path)
 
 
 def calibrated_force(adc_value: float | np.ndarray) -> float | np.ndarray:
-    return (CALIBRATION_INTERCEPT + CALIBRATION_SLOPE * adc_value) * GRAVITATIONAL_CONSTANT + FORCE_OFFSET
+    force = adc_value * FORCE_SCALE
+    force += FORCE_BIAS
+    return force
 
 
 def convert_to_pressure(raw_values: np.ndarray) -> np.ndarray:
     return PRESSURE_SLOPE * raw_values + PRESSURE_INTERCEPT
 
 
-def zero_phase_lowpass(values: np.ndarray, cutoff_hz: float, order: int) -> np.ndarray:
-    if values.size < 3:
-        return values.copy()
+@lru_cache(maxsize=None)
+def lowpass_coefficients(cutoff_hz: float, order: int) -> tuple[np.ndarray, np.ndarray]:
     nyquist_hz = 0.5 * SAMPLING_RATE
     if cutoff_hz <= 0 or cutoff_hz >= nyquist_hz:
         raise ValueError(f"cutoff_hz must be between 0 and {nyquist_hz:.2f} Hz")
-    b, a = butter(order, cutoff_hz / nyquist_hz, btype="low")
+    return butter(order, cutoff_hz / nyquist_hz, btype="low")
+
+
+def zero_phase_lowpass(values: np.ndarray, cutoff_hz: float, order: int) -> np.ndarray:
+    if values.size < 3:
+        return values.copy()
+    b, a = lowpass_coefficients(cutoff_hz, order)
     padlen = 3 * (max(len(a), len(b)) - 1)
     if values.size <= padlen:
         return values.copy()
@@ -127,13 +135,13 @@ def fit_exponential_drift(time: np.ndarray, force: np.ndarray) -> dict[str, obje
 
 
 def find_event_bounds(signal: np.ndarray, threshold_ratio: float) -> dict[str, float | int]:
-    peak_value = float(np.max(signal))
     peak_idx = int(np.argmax(signal))
+    peak_value = float(signal[peak_idx])
     threshold_value = threshold_ratio * peak_value
     above_threshold = signal >= threshold_value
-    if np.any(above_threshold):
-        start_idx = int(np.where(above_threshold)[0][0])
-        end_idx = int(np.where(above_threshold)[0][-1])
+    start_idx = int(np.argmax(above_threshold))
+    if above_threshold[start_idx]:
+        end_idx = len(signal) - 1 - int(np.argmax(above_threshold[::-1]))
     else:
         start_idx = 0
         end_idx = len(signal) - 1
@@ -152,8 +160,10 @@ def calculate_horizontal_offset(raw_force: np.ndarray) -> float:
     baseline_seed = float(np.mean(filtered_force[:seed_count]))
     peak_force = float(np.max(filtered_force))
     trigger_force = baseline_seed + THRUST_EVENT_THRESHOLD_RATIO * (peak_force - baseline_seed)
-    ignition_candidates = np.where(filtered_force >= trigger_force)[0]
-    ignition_idx = int(ignition_candidates[0]) if ignition_candidates.size else filtered_force.size - 1
+    above_trigger = filtered_force >= trigger_force
+    ignition_idx = int(np.argmax(above_trigger))
+    if not above_trigger[ignition_idx]:
+        ignition_idx = filtered_force.size - 1
     averaging_end_idx = max(1, ignition_idx // 2)
     return float(np.mean(raw_force[:averaging_end_idx]))
 
@@ -186,6 +196,12 @@ def apply_drift_correction(time: np.ndarray, raw_force: np.ndarray, drift_force:
     }
 
 
+def trapezoid_uniform(values: np.ndarray, dx: float) -> float:
+    if values.size == 0:
+        return 0.0
+    return float(dx * (values.sum(dtype=np.float64) - 0.5 * (float(values[0]) + float(values[-1]))))
+
+
 def calculate_pressure_baseline(pressure_values: np.ndarray) -> float:
     if pressure_values.size == 0:
         return 0.0
@@ -216,7 +232,7 @@ def calculate_thrust_metrics(
     ignition_time = float(time[ignition_idx])
     burnout_time = float(time[burnout_idx])
     burn_time = burnout_time - ignition_time
-    total_impulse = float(np.trapezoid(filtered_force[ignition_idx:burnout_idx + 1], dx=dt))
+    total_impulse = trapezoid_uniform(filtered_force[ignition_idx:burnout_idx + 1], dt)
     avg_thrust = total_impulse / burn_time if burn_time > 0 else 0.0
     specific_impulse = None
     if propellant_mass is not None and propellant_mass > 0:
@@ -248,8 +264,9 @@ def save_current_figure(filename: str) -> None:
 
 
 def main() -> None:
-    loadcell_adc = load_interleaved_channel(INPUT_FILE, LOADCELL_CHANNEL_INDEX)
-    barometer_raw = load_interleaved_channel(INPUT_FILE, BAROMETER_CHANNEL_INDEX)
+    interleaved_values = load_interleaved_values(INPUT_FILE)
+    loadcell_adc = extract_channel(interleaved_values, LOADCELL_CHANNEL_INDEX)
+    barometer_raw = extract_channel(interleaved_values, BAROMETER_CHANNEL_INDEX)
     drift_adc = load_single_channel_values(DRIFT_FILE) if DRIFT_MODE == "exponential" else np.array([], dtype=float)
     time = np.arange(loadcell_adc.size) / SAMPLING_RATE
 
@@ -7,17 +7,25 @@ import numpy as np
 # Configuration
 input_file = '/Users/leetaeho/TMS/Data/11_27/calibrated_loadcell_test.txt'
 
-# Load data (skip header)
-data = np.loadtxt(input_file, skiprows=1)
+# Load data (binary .npy as-is, text with header skipped)
+if input_file.endswith('.npy'):
+    data = np.load(input_file)
+else:
+    data = np.loadtxt(input_file, skiprows=1)
 time = data[:, 0]
 force = data[:, 1]
 
 # Calculate offset statistics
+# One partition gives min, max and the median element(s) without a full sort
+n_samples = len(force)
+lower_mid = (n_samples - 1) // 2
+upper_mid = n_samples // 2
+ordered = np.partition(force, [0, lower_mid, upper_mid, n_samples - 1])
+min_force = ordered[0]
+max_force = ordered[-1]
+median_offset = 0.5 * (ordered[lower_mid] + ordered[upper_mid])
 mean_offset = np.mean(force)
-median_offset = np.median(force)
-std_offset = np.std(force)
-min_force = np.min(force)
-max_force = np.max(force)
+std_offset = np.sqrt(np.mean(np.square(force - mean_offset)))
 
 # Calculate offset using first N samples (assuming no load at start)
 initial_samples = min(100, len(force))
@@ -3,6 +3,9 @@ Script to convert all number signs in calibration data files
 Converts TEST_*.TXT files by negating all numeric values
 """
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 # ===== CONFIGURATION =====
 data_dir = '/Users/leetaeho/TMS/Data/11_27/calidata'
@@ -12,40 +15,59 @@ output_dir = '/Users/leetaeho/TMS/Data/11_27/calidata_positive'
 # Create output directory if it doesn't exist
 os.makedirs(output_dir, exist_ok=True)
 
-# Read and convert all numbers
-converted_count = 0
-for i in range(20):
+# One complete number in decimal or exponent form, or inf/infinity (any case)
+number = rb'(?:(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|(?i:inf(?:inity)?))'
+
+# Sign (or missing sign) at the start of a line that holds exactly one number,
+# after any leading blanks; lines such as "over", "3.3V", "1 over" or "." do not match
+numeric_line = re.compile(rb'^[ \t]*(?:(-)|\+)?(?=' + number + rb'[ \t\r]*$)', re.MULTILINE)
+
+
+def flip_sign(match):
+    """Drop a leading '-', otherwise put '-' in front of the number"""
+    return b"" if match.group(1) else b"-"
+
+
+def process_one(i):
+    """Convert TEST_{i}.TXT; returns (converted, message)"""
     filename = f'TEST_{i}.TXT'
-    input_filepath = os.path.join(data_dir, filename)
-    output_filepath = os.path.join(output_dir, filename)
-    
+    input_filepath = Path(data_dir) / filename
+    output_filepath = Path(output_dir) / filename
+
     # Skip if input file doesn't exist
-    if not os.path.isfile(input_filepath):
-        print(f"파일 없음: {filename}")
-        continue
-
-    converted_lines = []
-    with open(input_filepath, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if line:  # If line is not empty
-                try:
-                    number = float(line)
-                    # Convert sign (multiply by -1)
-                    converted_number = -number
-                    converted_lines.append(f"{converted_number}\n")
-                except ValueError:
-                    # If not a number, keep as is
-                    converted_lines.append(f"{line}\n")
-            else:
-                converted_lines.append("\n")
-
-    # Write to output file
-    with open(output_filepath, 'w') as file:
-        file.writelines(converted_lines)
-    
-    converted_count += 1
-    print(f"✓ 변환 완료: {filename}")
+    if filename not in existing_files:
+        return False, f"파일 없음: {filename}"
+
+    # Read once (bytes, no text decoding)
+    data = input_filepath.read_bytes()
+
+    # Edit the signs in one pass over the buffer, without per-line objects
+    # (non-numeric lines such as "over" are left untouched, so a file with
+    # nothing to negate comes back unchanged)
+    converted_data = numeric_line.sub(flip_sign, data)
+
+    # Skip the write if a previous run already produced the same output
+    if output_filepath.is_file() and output_filepath.read_bytes() == converted_data:
+        return True, f"✓ 이미 변환됨: {filename}"
+
+    # Write to output file in a single call
+    output_filepath.write_bytes(converted_data)
+
+    return True, f"✓ 변환 완료: {filename}"
+
+
+# List the input directory once instead of stat-ing every TEST file
+with os.scandir(data_dir) as entries:
+    existing_files = {entry.name for entry in entries if entry.is_file()}
+
+# Read and convert all numbers (files are independent, so convert them in parallel)
+with ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) * 2)) as executor:
+    results = list(executor.map(process_one, range(20)))
+
+# Print after the join so messages stay in file order
+for converted, message in results:
+    print(message)
+converted_count = sum(converted for converted, _ in results)
 
 print(f"\n모든 파일 변환 완료!")
 print(f"  변환된 파일 수: {converted_count}")